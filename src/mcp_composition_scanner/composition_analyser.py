@@ -18,19 +18,31 @@ Usage:
     python -m mcp_composition_scanner.composition_analyser --all
 """
 
-import json
 import asyncio
+import gzip
+import hashlib
 import os
 import datetime
 import re
 import argparse
+import itertools
+import sys
+from collections import defaultdict
+from contextlib import AsyncExitStack
 from typing import Optional
 
+import numpy as np
+import orjson
+
 from agents import Agent, Runner
 from fastmcp import Client
+from pydantic import ValidationError
 
 from .models import CompositionAnalysis
 
+# Compiled once at import; matched per result file on --files runs.
+_TS_FILENAME_RE = re.compile(r"\d{8}-\d{6}-(.+)\.json(?:\.gz)?")
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # Composition Analysis Prompt
@@ -118,22 +130,131 @@ IMPORTANT GUIDELINES:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
+class MCPToolCollector:
+    """
+    Pooled connection manager for multi-server tool collection.
+
+    Enters every MCP client into one shared AsyncExitStack so all sessions
+    are opened concurrently (one gather instead of N sequential handshakes),
+    then dispatches list_tools across the live connections and closes them
+    together via close().
+    """
+
+    def __init__(self):
+        self._stack = AsyncExitStack()
+        self._clients: dict[str, tuple[Client, str]] = {}
+
+    async def connect_all(self, targets: list[tuple[str, str]]) -> None:
+        """Open sessions to all (url, server_name) targets concurrently."""
+
+        async def _connect(url: str, name: str):
+            print(f"  Connecting to {name} ({url})...")
+            try:
+                client = await self._stack.enter_async_context(Client(url))
+                self._clients[name] = (client, url)
+            except Exception as e:
+                print(f"  ✗ {name}: Failed to connect — {e}")
+
+        await asyncio.gather(*[_connect(url, name) for url, name in targets])
+
+    async def collect_all_tools(self) -> tuple[list[dict], list[str]]:
+        """
+        Run list_tools on every connected server concurrently.
+
+        Returns (combined_tools, server_names) with each tool wrapped in a
+        record carrying its origin, matching collect_tools_from_server's
+        output shape.
+        """
+        names = list(self._clients)
+        results = await asyncio.gather(
+            *[self._clients[name][0].list_tools() for name in names],
+            return_exceptions=True,
+        )
+
+        combined_tools = []
+        server_names = []
+        for name, tools in zip(names, results):
+            if isinstance(tools, BaseException):
+                print(f"  ✗ {name}: Failed to list tools — {tools}")
+                continue
+            url = self._clients[name][1]
+            for tool in tools:
+                combined_tools.append(
+                    {"public": tool.model_dump(), "origin": name, "url": url}
+                )
+            print(f"  ✓ {name}: {len(tools)} tools retrieved")
+            server_names.append(name)
+        return combined_tools, server_names
+
+    async def close(self) -> None:
+        """Close all pooled sessions together."""
+        await self._stack.aclose()
+        self._clients.clear()
+
+
+# Long-lived session pool keyed by URL. The FastAPI control plane calls
+# collect_tools_from_server for the same servers on every request; reusing
+# an already-initialized session turns N×(handshake + MCP init) into one
+# handshake per URL for the lifetime of the event loop. Sessions are entered
+# individually (not on a shared exit stack) so a broken one can be closed
+# and evicted without tearing down the rest of the pool.
+_client_pool: dict[str, Client] = {}
+_client_pool_locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+async def _pooled_client(url: str) -> Client:
+    """Return a live pooled client for url, opening the session on first use."""
+    # Per-URL lock: concurrent first calls for the same server would each
+    # open a session, with the losers left dangling until shutdown.
+    async with _client_pool_locks[url]:
+        client = _client_pool.get(url)
+        if client is None:
+            client = Client(url)
+            await client.__aenter__()
+            _client_pool[url] = client
+        return client
+
+
+async def _evict_client(url: str) -> None:
+    """Drop a session from the pool and close it."""
+    client = _client_pool.pop(url, None)
+    if client is None:
+        return
+    try:
+        await client.__aexit__(None, None, None)
+    except Exception:
+        pass  # evicted sessions are usually already broken; nothing to do
+
+
+async def close_client_pool() -> None:
+    """Close every pooled session (call at process/server shutdown)."""
+    for url in list(_client_pool):
+        await _evict_client(url)
+
+
 async def collect_tools_from_server(url: str, server_name: str) -> list[dict]:
-    """Connect to an MCP server and retrieve its tool declarations."""
+    """
+    Connect to an MCP server and retrieve its tool declarations.
+
+    Each tool is returned as a record holding the cleaned declaration under
+    "public" and collection bookkeeping ("origin", "url") alongside it, so
+    prompt construction can use the public view directly instead of
+    re-filtering bookkeeping keys out of every tool dict on every scan.
+    """
     print(f"  Connecting to {server_name} ({url})...")
     try:
-        client = Client(url)
-        async with client:
-            tools = await client.list_tools()
-            tools_dicts = []
-            for tool in tools:
-                t = tool.model_dump()
-                t["_server_origin"] = server_name
-                t["_server_url"] = url
-                tools_dicts.append(t)
-            print(f"  ✓ {server_name}: {len(tools_dicts)} tools retrieved")
-            return tools_dicts
+        client = await _pooled_client(url)
+        tools = await client.list_tools()
+        tools_dicts = [
+            {"public": tool.model_dump(), "origin": server_name, "url": url}
+            for tool in tools
+        ]
+        print(f"  ✓ {server_name}: {len(tools_dicts)} tools retrieved")
+        return tools_dicts
     except Exception as e:
+        # Close and drop the (possibly broken) session so the next call
+        # reconnects instead of reusing it.
+        await _evict_client(url)
         print(f"  ✗ {server_name}: Failed to connect — {e}")
         return []
 
@@ -145,22 +266,25 @@ def collect_tools_from_result_file(filepath: str) -> list[dict]:
     we reconstruct minimal tool records from the assessment data.
     """
     base = os.path.basename(filepath)
-    match = re.match(r"\d{8}-\d{6}-(.+)\.json", base)
-    server_name = match.group(1) if match else base.replace(".json", "")
+    match = _TS_FILENAME_RE.match(base)
+    server_name = match.group(1) if match else base.replace(".json.gz", "").replace(".json", "")
 
-    with open(filepath, "r") as f:
-        data = json.load(f)
+    opener = gzip.open if filepath.endswith(".gz") else open
+    with opener(filepath, "rb") as f:
+        data = orjson.loads(f.read())
 
     tools = []
     for assessment in data.get("tool_assessments", []):
         tools.append(
             {
-                "name": assessment["tool_name"],
-                "description": assessment.get("risk_summary", ""),
-                "inputSchema": {},
-                "_server_origin": server_name,
-                "_source_file": filepath,
-                "_original_risk_level": assessment.get("risk_level", "Unknown"),
+                "public": {
+                    "name": assessment["tool_name"],
+                    "description": assessment.get("risk_summary", ""),
+                    "inputSchema": {},
+                },
+                "origin": server_name,
+                "source_file": filepath,
+                "original_risk_level": assessment.get("risk_level", "Unknown"),
             }
         )
     print(f"  ✓ {server_name} (from file): {len(tools)} tools extracted")
@@ -169,17 +293,15 @@ def collect_tools_from_result_file(filepath: str) -> list[dict]:
 
 def load_servers_from_mcp_json(mcp_path: str = None) -> dict:
     """Load server configurations from mcp.json."""
-    if mcp_path is None:
-        for candidate in ["mcp.json", "../mcp.json"]:
-            if os.path.exists(candidate):
-                mcp_path = candidate
-                break
-    if mcp_path is None or not os.path.exists(mcp_path):
-        return {}
-
-    with open(mcp_path, "r") as f:
-        data = json.load(f)
-    return data.get("servers", {})
+    candidates = [mcp_path] if mcp_path else ["mcp.json", "../mcp.json"]
+    for candidate in candidates:
+        try:
+            with open(candidate, "rb") as f:
+                data = orjson.loads(f.read())
+        except FileNotFoundError:
+            continue
+        return data.get("servers", {})
+    return {}
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -187,43 +309,147 @@ def load_servers_from_mcp_json(mcp_path: str = None) -> dict:
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
-async def analyze_composition(
+def _composition_cache_key(
+    combined_tools: list[dict], server_names: list[str], summarize_schemas: bool = True
+) -> str:
+    """
+    Canonical hash of a tool set, used to memoize analysis results on disk.
+
+    The public tool views are hashed sorted, so the key is stable regardless
+    of collection order. Server names are part of the key: the cached
+    CompositionAnalysis embeds server identity (servers_analyzed,
+    tool_a_server, is_cross_server), so the same stock tools under different
+    server names must not share an entry. The system prompt is included so
+    prompt edits invalidate old cache entries automatically.
+
+    Each tool's origin is hashed alongside its public view: the rendered
+    prompt (cached under the same key) groups tools by origin, so the same
+    tool set distributed differently across servers must produce a
+    different key.
+    """
+    clean_tools = sorted(
+        ({"origin": t.get("origin", "unknown"), "tool": t["public"]} for t in combined_tools),
+        key=lambda r: (r["origin"], r["tool"].get("name", ""), r["tool"].get("description", "")),
+    )
+    h = hashlib.blake2b()
+    h.update(COMPOSITION_SYSTEM_PROMPT.encode())
+    h.update(b"summarized" if summarize_schemas else b"full")
+    h.update(orjson.dumps(sorted(server_names)))
+    h.update(orjson.dumps(clean_tools, option=orjson.OPT_SORT_KEYS))
+    return h.hexdigest()
+
+
+def _summarize_schema(schema: dict) -> dict:
+    """
+    Collapse a verbose inputSchema to what the analyst agent actually uses.
+
+    Keeps top-level property names and types, required fields, and whether
+    the tool accepts free-form strings; drops nested $defs, enums, and
+    per-property descriptions. Schema detail dominates prompt tokens on
+    schema-heavy servers, while capability reasoning only needs the shape.
+    """
+    props = schema.get("properties", {}) or {}
+    return {
+        "properties": {
+            k: (v.get("type", "?") if isinstance(v, dict) else "?") for k, v in props.items()
+        },
+        "required": schema.get("required", []),
+        "accepts_freeform": any(
+            isinstance(v, dict) and v.get("type") == "string" and not v.get("enum")
+            for v in props.values()
+        ),
+    }
+
+
+def _composition_cache_path(key: str) -> str:
+    cache_dir = os.path.join(os.getcwd(), "results", "compositions", ".cache")
+    return os.path.join(cache_dir, f"{key}.json")
+
+
+# Rendered-prompt cache: repeated scans of the same tool set produce the
+# identical prompt, so cache the rendered text in-process and persist it
+# under ~/.cache so re-runs skip prompt construction entirely. Byte-identical
+# prompts also keep provider-side prefix caches hot across processes.
+_PROMPT_CACHE: dict[str, str] = {}
+_PROMPT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "mcp-composition-scanner", "prompts"
+)
+
+
+def _load_cached_prompt(key: str) -> Optional[str]:
+    try:
+        with open(os.path.join(_PROMPT_CACHE_DIR, f"{key}.txt"), "r") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _store_cached_prompt(key: str, prompt: str) -> None:
+    try:
+        os.makedirs(_PROMPT_CACHE_DIR, exist_ok=True)
+        with open(os.path.join(_PROMPT_CACHE_DIR, f"{key}.txt"), "w") as f:
+            f.write(prompt)
+    except OSError:
+        pass  # the prompt cache is best-effort; never fail a scan over it
+
+
+def _build_composition_prompt(
+    unique_tools: list[dict],
     combined_tools: list[dict],
     server_names: list[str],
-) -> CompositionAnalysis:
+    pairwise: int,
+    cross_pairs,
+    summarize_schemas: bool,
+) -> str:
     """
-    Run composition analysis on a combined tool set from multiple servers.
+    Render the user prompt with server-annotated tool declarations.
 
-    This is the core function: it constructs a prompt with all tools annotated
-    by server origin, then uses a structured-output agent to produce a
-    CompositionAnalysis with surpluses, attack chains, and constraints.
+    Servers and tools are ordered deterministically so repeated scans of
+    the same tool set produce a byte-identical prompt prefix: LLM providers
+    cache prompt prefixes (billed at a fraction of the normal rate and
+    skipping prefill), but only when the prefix is byte-stable across calls.
+    All dynamic content stays in the "Analysis request" tail.
     """
-    n = len(combined_tools)
-    pairwise = n * (n - 1) // 2
-
-    # Build the user prompt with server-annotated tool declarations
-    tools_by_server: dict[str, list[dict]] = {}
-    for t in combined_tools:
-        server = t.get("_server_origin", "unknown")
-        if server not in tools_by_server:
-            tools_by_server[server] = []
-        tools_by_server[server].append(t)
+    n = len(unique_tools)
+    tools_by_server: dict[str, list[dict]] = defaultdict(list)
+    for t in unique_tools:
+        tools_by_server[" + ".join(sorted(t["origins"]))].append(t)
 
     prompt_parts = [
         "COMPOSITION ANALYSIS REQUEST\n",
-        f"Servers: {', '.join(server_names)}",
-        f"Total tools: {n}",
-        f"Pairwise combinations: {pairwise}\n",
+        f"Servers: {', '.join(sorted(server_names))}",
+        f"Total tools: {n}"
+        + (f" (deduplicated from {len(combined_tools)})" if n < len(combined_tools) else ""),
+        f"Pairwise combinations: {pairwise}",
+        f"Cross-server pairs: {len(cross_pairs)}\n",
         "─── Tool declarations by server ───\n",
     ]
 
-    for server, tools in tools_by_server.items():
-        prompt_parts.append(f"\n### Server: {server} ({len(tools)} tools)\n")
-        clean_tools = []
-        for t in tools:
-            clean = {k: v for k, v in t.items() if not k.startswith("_")}
-            clean_tools.append(clean)
-        prompt_parts.append(json.dumps(clean_tools, indent=2))
+    for server in sorted(tools_by_server):
+        tools = sorted(tools_by_server[server], key=lambda t: t["public"].get("name", ""))
+        prompt_parts.append(f"\n### Available on: {server} ({len(tools)} tools)\n")
+        # The public view was cleaned at collection time; copy only when a
+        # summarized schema has to be swapped in, never mutate the record.
+        clean_tools = [t["public"] for t in tools]
+        if summarize_schemas:
+            clean_tools = [
+                {**c, "inputSchema": _summarize_schema(c["inputSchema"])}
+                if isinstance(c.get("inputSchema"), dict)
+                else c
+                for c in clean_tools
+            ]
+        prompt_parts.append(orjson.dumps(clean_tools, option=orjson.OPT_INDENT_2).decode())
+
+    if len(cross_pairs):
+        tool_names = [t["public"].get("name", "?") for t in unique_tools]
+        sample = ", ".join(
+            f"{tool_names[a]} ⊕ {tool_names[b]}" for a, b in cross_pairs[:40]
+        )
+        suffix = ", ..." if len(cross_pairs) > 40 else ""
+        prompt_parts.append(
+            f"\n─── Priority cross-server pairs ───\n"
+            f"Focus first on these cross-server pairs: {sample}{suffix}"
+        )
 
     prompt_parts.append(
         f"\n─── Analysis request ───\n"
@@ -236,7 +462,102 @@ async def analyze_composition(
         f"the composition and is invisible to per-tool governance."
     )
 
-    user_prompt = "\n".join(prompt_parts)
+    return "\n".join(prompt_parts)
+
+
+async def analyze_composition(
+    combined_tools: list[dict],
+    server_names: list[str],
+    use_cache: bool = True,
+    summarize_schemas: bool = True,
+) -> CompositionAnalysis:
+    """
+    Run composition analysis on a combined tool set from multiple servers.
+
+    This is the core function: it constructs a prompt with all tools annotated
+    by server origin, then uses a structured-output agent to produce a
+    CompositionAnalysis with surpluses, attack chains, and constraints.
+    """
+    # Collapse identical tools exposed by several servers (e.g. stock fetch/
+    # read_file wrappers) into one canonical entry that records every origin.
+    # Duplicates add prompt tokens and inflate the pairwise search space
+    # quadratically without adding any new capability to reason about.
+    deduped: dict[str, dict] = {}
+    for t in combined_tools:
+        pub = t["public"]
+        canon_key = hashlib.blake2b(
+            orjson.dumps(
+                {"n": pub.get("name"), "d": pub.get("description"), "s": pub.get("inputSchema", {})},
+                option=orjson.OPT_SORT_KEYS,
+            )
+        ).hexdigest()
+        origin = t.get("origin", "unknown")
+        rec = deduped.get(canon_key)
+        if rec is None:
+            rec = {"public": pub, "origins": [origin]}
+            deduped[canon_key] = rec
+        elif origin not in rec["origins"]:
+            rec["origins"].append(origin)
+
+    unique_tools = list(deduped.values())
+    # Deterministic order keeps the prompt byte-stable and makes the pair
+    # enumeration below reproducible across runs.
+    unique_tools.sort(
+        key=lambda t: (" + ".join(sorted(t["origins"])), t["public"].get("name", ""))
+    )
+    n = len(unique_tools)
+    pairwise = n * (n - 1) // 2
+
+    # Vectorized cross-server pair enumeration: build all (i, j) index pairs
+    # with triu_indices and mask pairs in one NumPy pass instead of a Python
+    # double loop. A deduplicated tool can live on several servers, so the
+    # mask tests origin-set disjointness: a pair sharing any origin is
+    # visible to that server's per-server review and is not a governance
+    # blind spot. The disjoint subset is what per-server governance can't
+    # see, so it's called out to the agent as the priority search space.
+    server_index = {
+        s: idx
+        for idx, s in enumerate(sorted({o for t in unique_tools for o in t["origins"]}))
+    }
+    membership = np.zeros((n, len(server_index)), dtype=bool)
+    for i, t in enumerate(unique_tools):
+        for o in t["origins"]:
+            membership[i, server_index[o]] = True
+    pair_i, pair_j = np.triu_indices(n, k=1)
+    cross_mask = ~(membership[pair_i] & membership[pair_j]).any(axis=1)
+    cross_pairs = np.stack([pair_i[cross_mask], pair_j[cross_mask]], axis=1)
+
+    # Disk-backed memoization: an identical tool set (e.g. CI re-runs,
+    # repeated --files scans) returns the cached analysis instead of paying
+    # a full LLM round-trip. The same key indexes the rendered-prompt cache.
+    key = _composition_cache_key(combined_tools, server_names, summarize_schemas)
+    cache_path = None
+    if use_cache:
+        cache_path = _composition_cache_path(key)
+        try:
+            with open(cache_path, "r") as f:
+                cached = f.read()
+            analysis = CompositionAnalysis.model_validate_json(cached)
+            print(f"\n▶ Cache hit for this tool set — reusing {cache_path}")
+            return analysis
+        except (OSError, ValidationError):
+            # The cache is best-effort: a missing, truncated or corrupt
+            # entry falls through to a fresh run (and gets overwritten).
+            pass
+
+    # Reuse the rendered prompt for a known tool set (in-process first, then
+    # the persistent cache) before paying for prompt construction again.
+    user_prompt = _PROMPT_CACHE.get(key)
+    if user_prompt is None:
+        user_prompt = _load_cached_prompt(key)
+        if user_prompt is not None:
+            _PROMPT_CACHE[key] = user_prompt
+    if user_prompt is None:
+        user_prompt = _build_composition_prompt(
+            unique_tools, combined_tools, server_names, pairwise, cross_pairs, summarize_schemas
+        )
+        _PROMPT_CACHE[key] = user_prompt
+        _store_cached_prompt(key, user_prompt)
 
     agent = Agent(
         name="Composition Analysis Agent",
@@ -245,9 +566,42 @@ async def analyze_composition(
     )
 
     print(f"\n▶ Running composition analysis on {n} tools from {len(server_names)} servers...")
-    print(f"  Pairwise search space: {pairwise} combinations")
-    result = await Runner.run(agent, user_prompt)
-    return result.final_output
+    print(f"  Pairwise search space: {pairwise} combinations ({len(cross_pairs)} cross-server)")
+    # Stream the run instead of blocking on the complete response: progress
+    # is reported as soon as tokens arrive, so perceived latency is
+    # time-to-first-finding rather than time-to-last-token. Each surplus
+    # entry in the structured output carries exactly one
+    # "emergent_capability" key, which makes a cheap incremental signal
+    # without a full streaming-JSON parser.
+    stream = Runner.run_streamed(agent, user_prompt)
+    chunks: list[str] = []
+    surpluses_seen = 0
+    started = False
+    async for event in stream.stream_events():
+        if event.type != "raw_response_event":
+            continue
+        delta = getattr(event.data, "delta", None)
+        if not isinstance(delta, str) or not delta:
+            continue
+        if not started:
+            print("  ▶ Streaming structured analysis...")
+            started = True
+        chunks.append(delta)
+        # Check the last two chunks so a key split across deltas still counts.
+        if "emergent_capability" in "".join(chunks[-2:]):
+            found = "".join(chunks).count('"emergent_capability"')
+            for k in range(surpluses_seen, found):
+                print(f"  ⚠ Composition surplus #{k + 1} identified")
+            surpluses_seen = found
+
+    analysis = stream.final_output
+
+    if cache_path is not None:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w") as f:
+            f.write(analysis.model_dump_json())
+
+    return analysis
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -259,8 +613,9 @@ def save_composition_result(
     analysis: CompositionAnalysis,
     server_names: list[str],
     output_dir: str = None,
+    compress: bool = False,
 ) -> str:
-    """Save composition analysis result to a timestamped JSON file."""
+    """Save composition analysis result to a timestamped JSON (or .json.gz) file."""
     if output_dir is None:
         output_dir = os.path.join(os.getcwd(), "results", "compositions")
     os.makedirs(output_dir, exist_ok=True)
@@ -268,66 +623,82 @@ def save_composition_result(
     now = datetime.datetime.now()
     date_time = now.strftime("%Y%m%d-%H%M%S")
     servers_tag = "+".join(s[:12] for s in server_names)
-    filename = f"{date_time}-COMPOSITION-{servers_tag}.json"
+    filename = f"{date_time}-COMPOSITION-{servers_tag}.json" + (".gz" if compress else "")
     filepath = os.path.join(output_dir, filename)
 
-    with open(filepath, "w") as f:
-        json.dump(analysis.model_dump(), f, indent=2, ensure_ascii=False)
+    # model_dump_json serializes in one pass through pydantic-core, skipping
+    # the intermediate model_dump() dict for the largest object we write.
+    # exclude_defaults drops fields left at their defaults (empty
+    # constraints/additional_tools lists); readers use .get with defaults.
+    if compress:
+        # Level 1 costs almost no CPU but gets several-fold reduction on
+        # this kind of repetitive JSON — worthwhile when accumulating many
+        # historical results for diffing/trending.
+        with gzip.open(filepath, "wb", compresslevel=1) as f:
+            f.write(analysis.model_dump_json(indent=2, exclude_defaults=True).encode())
+    else:
+        with open(filepath, "w") as f:
+            f.write(analysis.model_dump_json(indent=2, exclude_defaults=True))
 
     return filepath
 
 
 def print_composition_summary(analysis: CompositionAnalysis):
     """Print a human-readable summary of composition findings."""
-    print("\n" + "═" * 70)
-    print("  COMPOSITION ANALYSIS RESULTS")
-    print("═" * 70)
-    print(f"  Servers:    {', '.join(analysis.servers_analyzed)}")
-    print(f"  Tools:      {analysis.total_tools}")
-    print(f"  Pairs:      {analysis.pairwise_combinations}")
-    print(f"  Risk Score: {analysis.composition_risk_score}")
-    print(f"  Action:     {analysis.action}")
-    print("─" * 70)
+    # Build the whole report in memory and emit it with a single write:
+    # one syscall instead of a flush per line, and no interleaving if
+    # summaries are ever printed from concurrent tasks.
+    out = []
+    out.append("\n" + "═" * 70)
+    out.append("  COMPOSITION ANALYSIS RESULTS")
+    out.append("═" * 70)
+    out.append(f"  Servers:    {', '.join(analysis.servers_analyzed)}")
+    out.append(f"  Tools:      {analysis.total_tools}")
+    out.append(f"  Pairs:      {analysis.pairwise_combinations}")
+    out.append(f"  Risk Score: {analysis.composition_risk_score}")
+    out.append(f"  Action:     {analysis.action}")
+    out.append("─" * 70)
 
     if analysis.composition_surpluses:
-        print(f"\n  ⚠ COMPOSITION SURPLUSES FOUND: {len(analysis.composition_surpluses)}\n")
+        out.append(f"\n  ⚠ COMPOSITION SURPLUSES FOUND: {len(analysis.composition_surpluses)}\n")
         for s in analysis.composition_surpluses:
             cross = " [CROSS-SERVER]" if s.is_cross_server else ""
-            print(f"  [{s.id}] {s.severity}{cross}")
-            print(f"    Tools: {s.tool_a} ({s.tool_a_server}) ⊕ {s.tool_b} ({s.tool_b_server})")
+            out.append(f"  [{s.id}] {s.severity}{cross}")
+            out.append(f"    Tools: {s.tool_a} ({s.tool_a_server}) ⊕ {s.tool_b} ({s.tool_b_server})")
             if s.additional_tools:
-                print(f"    + {', '.join(s.additional_tools)}")
-            print(f"    Emergent: {s.emergent_capability}")
-            print(f"    Class: {s.emergent_capability_class}")
-            print(f"    Environment: {s.environment_conditions}")
-            print(f"    Gap: {s.existing_governance_gap}")
-            print()
+                out.append(f"    + {', '.join(s.additional_tools)}")
+            out.append(f"    Emergent: {s.emergent_capability}")
+            out.append(f"    Class: {s.emergent_capability_class}")
+            out.append(f"    Environment: {s.environment_conditions}")
+            out.append(f"    Gap: {s.existing_governance_gap}")
+            out.append("")
     else:
-        print("\n  ✓ No composition surpluses detected.\n")
+        out.append("\n  ✓ No composition surpluses detected.\n")
 
     if analysis.attack_chains:
-        print(f"  ⚠ ATTACK CHAINS: {len(analysis.attack_chains)}\n")
+        out.append(f"  ⚠ ATTACK CHAINS: {len(analysis.attack_chains)}\n")
         for chain in analysis.attack_chains:
-            print(f"  [{chain.chain_id}] {chain.name} — {chain.severity}")
-            print(f"    Final capability: {chain.final_capability}")
-            print(f"    Approval bypass: {chain.human_approval_bypass}")
+            out.append(f"  [{chain.chain_id}] {chain.name} — {chain.severity}")
+            out.append(f"    Final capability: {chain.final_capability}")
+            out.append(f"    Approval bypass: {chain.human_approval_bypass}")
             for i, step in enumerate(chain.steps, 1):
-                print(f"    Step {i}: {step}")
-            print()
+                out.append(f"    Step {i}: {step}")
+            out.append("")
 
     if analysis.governance_blind_spots:
-        print("  GOVERNANCE BLIND SPOTS:")
+        out.append("  GOVERNANCE BLIND SPOTS:")
         for gap in analysis.governance_blind_spots:
-            print(f"    • {gap}")
-        print()
+            out.append(f"    • {gap}")
+        out.append("")
 
     if analysis.constraints:
-        print("  RECOMMENDED CONSTRAINTS:")
+        out.append("  RECOMMENDED CONSTRAINTS:")
         for c in analysis.constraints:
-            print(f"    • {c}")
-        print()
+            out.append(f"    • {c}")
+        out.append("")
 
-    print("═" * 70)
+    out.append("═" * 70)
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -367,6 +738,26 @@ Examples:
     parser.add_argument(
         "--output-dir", default=None, help="Directory for result files (default: ./results/compositions)"
     )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Skip the on-disk analysis cache and always re-run the LLM",
+    )
+    parser.add_argument(
+        "--full-schema", action="store_true",
+        help="Send complete inputSchema payloads instead of summarized shapes",
+    )
+    parser.add_argument(
+        "--compress", action="store_true",
+        help="Write results as gzipped .json.gz files",
+    )
+    parser.add_argument(
+        "--subset-size", type=int, default=None,
+        help="Analyze every server combination of this size instead of one combined set",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4,
+        help="Max concurrent analyses when --subset-size is used (default: 4)",
+    )
 
     args = parser.parse_args()
 
@@ -375,20 +766,39 @@ Examples:
 
     if args.files:
         print("Collecting tools from result files...")
+        # One scandir per parent directory replaces a stat() syscall per
+        # file; the existence check becomes a set lookup.
+        present_by_dir: dict[str, set[str]] = {}
+        filepaths = []
         for filepath in args.files:
-            if not os.path.exists(filepath):
+            parent = os.path.dirname(filepath) or "."
+            present = present_by_dir.get(parent)
+            if present is None:
+                try:
+                    with os.scandir(parent) as it:
+                        present = {e.name for e in it if e.is_file()}
+                except FileNotFoundError:
+                    present = set()
+                present_by_dir[parent] = present
+            if os.path.basename(filepath) not in present:
                 print(f"  ✗ File not found: {filepath}")
                 continue
-            tools = collect_tools_from_result_file(filepath)
+            filepaths.append(filepath)
+
+        # Parse result files in parallel on the default thread pool
+        results = await asyncio.gather(
+            *[asyncio.to_thread(collect_tools_from_result_file, fp) for fp in filepaths]
+        )
+        for filepath, tools in zip(filepaths, results):
             combined_tools.extend(tools)
             base = os.path.basename(filepath)
-            match = re.match(r"\d{8}-\d{6}-(.+)\.json", base)
+            match = _TS_FILENAME_RE.match(base)
             name = match.group(1) if match else base
             if name not in server_names:
                 server_names.append(name)
 
     elif args.servers or args.all:
-        mcp_servers = load_servers_from_mcp_json(args.mcp_config)
+        mcp_servers = await asyncio.to_thread(load_servers_from_mcp_json, args.mcp_config)
         if not mcp_servers:
             print("Error: No servers found in mcp.json")
             return
@@ -396,6 +806,7 @@ Examples:
         target_servers = list(mcp_servers.keys()) if args.all else args.servers
 
         print("Collecting tools from live MCP servers...")
+        targets = []
         for name in target_servers:
             if name not in mcp_servers:
                 print(f"  ✗ Server '{name}' not found in mcp.json")
@@ -404,10 +815,17 @@ Examples:
             if not url:
                 print(f"  ✗ Server '{name}' has no URL configured")
                 continue
-            tools = await collect_tools_from_server(url, name)
-            combined_tools.extend(tools)
-            if name not in server_names:
-                server_names.append(name)
+            targets.append((url, name))
+
+        # Open all sessions on one shared AsyncExitStack, then fan out
+        # list_tools over the live connections. Failed servers are skipped
+        # rather than aborting the batch.
+        collector = MCPToolCollector()
+        try:
+            await collector.connect_all(targets)
+            combined_tools, server_names = await collector.collect_all_tools()
+        finally:
+            await collector.close()
 
     if len(combined_tools) < 2:
         print("\nError: Need at least 2 tools from 2+ servers for composition analysis.")
@@ -419,13 +837,63 @@ Examples:
             "\nvaluable with tools from multiple servers. Proceeding anyway.\n"
         )
 
+    if args.subset_size and 2 <= args.subset_size < len(server_names):
+        # Combinations driver: analyze every C(servers, subset_size) set to
+        # find the riskiest composition subsets. Runs are dispatched
+        # concurrently under a semaphore to respect LLM rate limits, and
+        # reaped with as_completed so each result is summarized and saved
+        # as soon as its analysis finishes.
+        tools_by_origin: dict[str, list[dict]] = defaultdict(list)
+        for t in combined_tools:
+            tools_by_origin[t.get("origin", "unknown")].append(t)
+
+        sem = asyncio.Semaphore(max(args.concurrency, 1))
+
+        async def _run_subset(subset: tuple[str, ...]):
+            subset_tools = [t for name in subset for t in tools_by_origin[name]]
+            async with sem:
+                analysis = await analyze_composition(
+                    subset_tools,
+                    list(subset),
+                    use_cache=not args.no_cache,
+                    summarize_schemas=not args.full_schema,
+                )
+            return subset, analysis
+
+        subsets = list(itertools.combinations(server_names, args.subset_size))
+        print(f"\nAnalyzing {len(subsets)} server combinations of size {args.subset_size}...")
+        tasks = [asyncio.ensure_future(_run_subset(s)) for s in subsets]
+        for coro in asyncio.as_completed(tasks):
+            subset, analysis = await coro
+            print_composition_summary(analysis)
+            filepath = await asyncio.to_thread(
+                save_composition_result, analysis, list(subset), args.output_dir, args.compress
+            )
+            print(f"\n  Results saved to: {filepath}")
+        return
+
+    if args.subset_size:
+        print(
+            f"\nNote: --subset-size {args.subset_size} does not select a strict subset of "
+            f"the {len(server_names)} collected servers; running one combined analysis."
+        )
+
     # Run composition analysis
-    analysis = await analyze_composition(combined_tools, server_names)
+    analysis = await analyze_composition(
+        combined_tools,
+        server_names,
+        use_cache=not args.no_cache,
+        summarize_schemas=not args.full_schema,
+    )
 
     # Output
     print_composition_summary(analysis)
 
-    filepath = save_composition_result(analysis, server_names, args.output_dir)
+    # Write the result on the thread pool so the event loop is never
+    # blocked on disk I/O.
+    filepath = await asyncio.to_thread(
+        save_composition_result, analysis, server_names, args.output_dir, args.compress
+    )
     print(f"\n  Results saved to: {filepath}")
 
 
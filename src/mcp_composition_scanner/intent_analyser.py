@@ -25,6 +25,9 @@ from fastmcp import Client
 
 from .models import StructuredAnalysis
 
+# Compiled once at import; applied per generated filename.
+_SANITIZE_RE = re.compile(r"[^\w\-]")
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # System prompt for per-server analysis
@@ -77,13 +80,13 @@ def generate_filename(url: str, server_name: Optional[str] = None) -> str:
     date_time = now.strftime("%Y%m%d-%H%M%S")
 
     if server_name:
-        sanitized_name = re.sub(r"[^\w\-]", "_", server_name)
+        sanitized_name = _SANITIZE_RE.sub("_", server_name)
         return f"{date_time}-{sanitized_name}.json"
 
     parsed_url = urlparse(url)
     domain = parsed_url.netloc or "local"
     domain = domain.split(":")[0]
-    domain = re.sub(r"[^\w\-]", "_", domain)
+    domain = _SANITIZE_RE.sub("_", domain)
     return f"{date_time}-{domain}.json"
 
 
@@ -115,8 +118,9 @@ async def analyze_server(
 
         result = await Runner.run(agent, user_prompt)
 
-        analysis_result = result.final_output.model_dump()
-        print(json.dumps(analysis_result, indent=2, ensure_ascii=False))
+        # Serialize once via pydantic-core instead of model_dump() + json.dump
+        analysis_json = result.final_output.model_dump_json(indent=2)
+        print(analysis_json)
 
         # Save result
         if output_dir is None:
@@ -126,10 +130,10 @@ async def analyze_server(
         filepath = os.path.join(output_dir, filename)
 
         with open(filepath, "w") as f:
-            json.dump(analysis_result, f, indent=2, ensure_ascii=False)
+            f.write(analysis_json)
 
         print(f"Analysis result saved to {filepath}")
-        return analysis_result
+        return result.final_output.model_dump()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
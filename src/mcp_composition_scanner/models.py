@@ -5,8 +5,46 @@ Defines the structured output types used by the composition analysis agent
 to produce typed, machine-readable security assessments.
 """
 
-from pydantic import BaseModel, Field
-from typing import Literal
+from enum import StrEnum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Shared enumerations
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# StrEnum members validate via pydantic-core's enum lookup (interned-string
+# compare) rather than the per-value Literal string comparison, while still
+# serializing as plain strings.
+
+
+class RiskLevel(StrEnum):
+    """Three-level risk/confidence scale."""
+    LOW = "Low"
+    MEDIUM = "Medium"
+    HIGH = "High"
+
+
+class Severity(StrEnum):
+    """Four-level severity scale for attack paths, surpluses and chains."""
+    LOW = "Low"
+    MEDIUM = "Medium"
+    HIGH = "High"
+    CRITICAL = "Critical"
+
+
+class Action(StrEnum):
+    """Recommended action for a per-server toolset."""
+    ALLOW = "ALLOW"
+    BLOCK = "BLOCK"
+
+
+class CompositionAction(StrEnum):
+    """Recommended action for a combined, cross-server toolset."""
+    ALLOW = "ALLOW"
+    BLOCK = "BLOCK"
+    ALLOW_WITH_CONSTRAINTS = "ALLOW_WITH_CONSTRAINTS"
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -48,7 +86,7 @@ class ToolRiskAssessment(BaseModel):
     suspicious_language_patterns: list[str] = Field(
         description="List of specific phrases or patterns identified as suspicious."
     )
-    risk_level: Literal["Low", "Medium", "High"] = Field(
+    risk_level: RiskLevel = Field(
         description="Assessed risk level for this tool."
     )
     mitigation_suggestions: list[str] = Field(
@@ -58,10 +96,12 @@ class ToolRiskAssessment(BaseModel):
 
 class StructuredAnalysis(BaseModel):
     """Full per-server tool analysis output."""
+    model_config = ConfigDict(defer_build=False)
+
     tool_assessments: list[ToolRiskAssessment] = Field(
         description="Detailed risk assessment for each tool."
     )
-    overall_risk_score: Literal["Low", "Medium", "High"] = Field(
+    overall_risk_score: RiskLevel = Field(
         description="Overall risk score for the entire set of tools."
     )
     risk_evaluation_summary: str = Field(description="Summary of the overall risk evaluation.")
@@ -89,7 +129,7 @@ class StructuredAnalysis(BaseModel):
     recommendations: Recommendations = Field(
         description="Overall recommendations for the toolset."
     )
-    action: Literal["ALLOW", "BLOCK"] = Field(
+    action: Action = Field(
         description="Recommended action: ALLOW or BLOCK the toolset."
     )
 
@@ -98,7 +138,7 @@ class AttackPath(BaseModel):
     """A single-server attack path exploiting tool interactions."""
     description: str = Field(description="Description of the attack path.")
     involved_tools: list[str] = Field(description="Tools involved in this attack path.")
-    severity: Literal["Low", "Medium", "High", "Critical"] = Field(
+    severity: Severity = Field(
         description="Severity level of this attack path."
     )
     steps: list[str] = Field(
@@ -129,7 +169,7 @@ class CapabilityClass(BaseModel):
             "Authentication, FinancialTransaction, CloudInfra)."
         )
     )
-    confidence: Literal["Low", "Medium", "High"] = Field(
+    confidence: RiskLevel = Field(
         description="Confidence that this tool provides this capability class."
     )
 
@@ -172,7 +212,7 @@ class CompositionSurplus(BaseModel):
             "PrivilegeEscalation)."
         )
     )
-    severity: Literal["Low", "Medium", "High", "Critical"] = Field(
+    severity: Severity = Field(
         description="Severity of the emergent capability."
     )
     reasoning: str = Field(
@@ -205,7 +245,7 @@ class CompositionAttackChain(BaseModel):
     final_capability: str = Field(
         description="The ultimate unauthorized capability achieved."
     )
-    severity: Literal["Low", "Medium", "High", "Critical"] = Field(
+    severity: Severity = Field(
         description="Overall severity of the attack chain."
     )
     human_approval_bypass: str = Field(
@@ -222,6 +262,8 @@ class CompositionAnalysis(BaseModel):
     the complete analysis: tool vectors, composition surpluses (Σ_ij),
     attack chains, governance blind spots, and recommended constraints.
     """
+    model_config = ConfigDict(defer_build=False)
+
     servers_analyzed: list[str] = Field(
         description="List of MCP server names whose tools were included in this analysis."
     )
@@ -247,7 +289,7 @@ class CompositionAnalysis(BaseModel):
             "across different MCP servers."
         )
     )
-    composition_risk_score: Literal["Low", "Medium", "High", "Critical"] = Field(
+    composition_risk_score: Severity = Field(
         description="Overall composition risk score for the combined tool set."
     )
     governance_blind_spots: list[str] = Field(
@@ -259,7 +301,7 @@ class CompositionAnalysis(BaseModel):
     recommendations: list[str] = Field(
         description="Actionable recommendations to mitigate composition risks."
     )
-    action: Literal["ALLOW", "BLOCK", "ALLOW_WITH_CONSTRAINTS"] = Field(
+    action: CompositionAction = Field(
         description=(
             "Recommended action for the combined toolset. ALLOW_WITH_CONSTRAINTS "
             "means allow but enforce mutual exclusion or session-level monitoring."
@@ -272,3 +314,10 @@ class CompositionAnalysis(BaseModel):
             "enforce (e.g., 'tool A and tool B must not be co-invoked in same session')."
         )
     )
+
+
+# Resolve the "AttackPath" forward reference and build the core schemas once
+# at import time. Otherwise pydantic-core builds them lazily on the first
+# validation, which lands on the first /analyze-composition request.
+StructuredAnalysis.model_rebuild()
+CompositionAnalysis.model_rebuild()
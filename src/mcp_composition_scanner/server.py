@@ -8,15 +8,20 @@ Provides REST endpoints for:
 - Result retrieval
 """
 
-import json
 import asyncio
+import functools
+import gzip
 import os
-import glob
 import re
+import secrets
 from typing import List, Optional
 
-from fastapi import FastAPI, BackgroundTasks, HTTPException
-from pydantic import BaseModel, validator
+import aiofiles
+import orjson
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, field_validator
 import uvicorn
 
 from .intent_analyser import analyze_server
@@ -26,32 +31,58 @@ from .composition_analyser import (
     analyze_composition,
     save_composition_result,
     load_servers_from_mcp_json,
+    close_client_pool,
 )
 
+# Compiled once at import; matched per filename in /analyze-composition.
+_RESULT_NAME_RE = re.compile(r"\d{8}-\d{6}-(.+)\.json")
+
 app = FastAPI(
     title="MCP Composition Scanner",
     description="Cross-server capability composition risk analysis for MCP tool ecosystems",
     version="0.1.0",
+    # Serialize all responses through orjson instead of the stdlib encoder
+    default_response_class=ORJSONResponse,
 )
 
 
+@app.on_event("shutdown")
+async def _close_mcp_sessions():
+    """Stop queue workers and close pooled MCP client sessions."""
+    for task in _worker_tasks:
+        task.cancel()
+    _worker_tasks.clear()
+    await close_client_pool()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Request/Response models
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
+# Shared config for the request/response models: build validators eagerly at
+# import (no first-request schema build), ignore unknown payload keys, and
+# freeze instances so validated requests can't be mutated mid-flight.
+_API_MODEL_CONFIG = ConfigDict(extra="ignore", defer_build=False, frozen=True)
+
+
 class UrlRequest(BaseModel):
+    model_config = _API_MODEL_CONFIG
+
     url: str
     server_name: Optional[str] = None
 
-    @validator("url")
+    @field_validator("url", mode="before")
+    @classmethod
     def validate_url(cls, v):
-        if not v.startswith(("http://", "https://")):
+        if isinstance(v, str) and not v.startswith(("http://", "https://")):
             v = "http://" + v
         return v
 
 
 class AnalysisResponse(BaseModel):
+    model_config = _API_MODEL_CONFIG
+
     request_id: str
     status: str
     message: str
@@ -59,6 +90,8 @@ class AnalysisResponse(BaseModel):
 
 class CompositionRequest(BaseModel):
     """Request to analyze composition risk across multiple servers."""
+    model_config = _API_MODEL_CONFIG
+
     server_names: list[str] = []
     result_files: list[str] = []
 
@@ -67,15 +100,38 @@ class CompositionRequest(BaseModel):
 # Queue-based processing
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Per-server analyses are almost entirely I/O-bound (MCP fetch + LLM call),
+# so a fixed pool of long-lived workers drains the queue concurrently
+# instead of one item at a time. Worker count bounds in-flight analyses.
+WORKER_CONCURRENCY = int(os.getenv("MCP_SCAN_CONCURRENCY", "8"))
+
 analysis_queue: asyncio.Queue = asyncio.Queue()
-is_processing = False
+_worker_tasks: list[asyncio.Task] = []
+_active_jobs = 0
+
+def _new_request_id() -> str:
+    """Random request ID, unique across workers and restarts.
+
+    A per-process counter would restart at zero in every WEB_CONCURRENCY
+    worker (and on every restart), handing out duplicate IDs.
+    """
+    return f"req_{secrets.token_hex(8)}"
+
+
+def _normalize_url(url: str) -> str:
+    """Default to http:// for scheme-less URLs."""
+    if not url.startswith(("http://", "https://")):
+        url = "http://" + url
+    return url
 
 
 async def process_url(url: str, server_name: Optional[str] = None):
-    """Process a single server URL for analysis."""
+    """Process a single server URL for analysis.
+
+    Expects an already-normalized URL: the endpoints normalize once at
+    enqueue time instead of re-checking the scheme on every dequeue.
+    """
     try:
-        if not url.startswith(("http://", "https://")):
-            url = "http://" + url
         result = await analyze_server(url, server_name)
         return result
     except Exception as e:
@@ -83,44 +139,65 @@ async def process_url(url: str, server_name: Optional[str] = None):
         return {"error": str(e)}
 
 
-async def process_queue():
-    """Process analysis queue sequentially."""
-    global is_processing
-    if is_processing:
-        return
-
-    is_processing = True
-    try:
-        while not analysis_queue.empty():
-            queue_item = await analysis_queue.get()
-            try:
-                if isinstance(queue_item, tuple) and len(queue_item) == 2:
-                    url, server_name = queue_item
-                    await process_url(url, server_name)
-                else:
-                    await process_url(queue_item)
-            finally:
-                analysis_queue.task_done()
-    finally:
-        is_processing = False
+async def _queue_worker():
+    """Consume analysis jobs from the queue until cancelled."""
+    global _active_jobs
+    while True:
+        # Queue items are always (url, server_name_or_None) pairs.
+        url, server_name = await analysis_queue.get()
+        _active_jobs += 1
+        try:
+            await process_url(url, server_name)
+        finally:
+            _active_jobs -= 1
+            analysis_queue.task_done()
+
+
+@app.on_event("startup")
+async def _start_queue_workers():
+    """Launch the worker pool once; queue pushes are then non-blocking."""
+    for _ in range(WORKER_CONCURRENCY):
+        _worker_tasks.append(asyncio.create_task(_queue_worker()))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_servers_cached(path: str, mtime_ns: int) -> tuple[tuple[str, str], ...]:
+    """Parse (url, name) pairs from mcp.json, memoized per file mtime."""
+    with open(path, "rb") as f:
+        mcp_data = orjson.loads(f.read())
+    return tuple(
+        (config["url"], name)
+        for name, config in mcp_data.get("servers", {}).items()
+        if "url" in config
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_tools(path: str, mtime_ns: int) -> tuple:
+    """Parse tool records from a result file, memoized per file mtime.
+
+    The same result files get referenced across many /analyze-composition
+    requests; the mtime key invalidates automatically when a scan rewrites
+    the file. Returns a tuple so cached entries can't be mutated.
+    """
+    return tuple(collect_tools_from_result_file(path))
 
 
 def load_servers_from_mcp():
     """Load server (url, name) pairs from mcp.json."""
-    try:
-        for candidate in ["mcp.json", "../mcp.json"]:
-            if os.path.exists(candidate):
-                with open(candidate, "r") as f:
-                    mcp_data = json.load(f)
-                servers = []
-                for name, config in mcp_data.get("servers", {}).items():
-                    if "url" in config:
-                        servers.append((config["url"], name))
-                return servers
-        return []
-    except Exception as e:
-        print(f"Error loading servers from mcp.json: {e}")
-        return []
+    # mcp.json sits on the /analyze-all request path but rarely changes:
+    # a cheap stat keys the cache, so unchanged files skip read and parse.
+    for candidate in ["mcp.json", "../mcp.json"]:
+        try:
+            mtime_ns = os.stat(candidate).st_mtime_ns
+        except FileNotFoundError:
+            continue
+        try:
+            return list(_load_servers_cached(candidate, mtime_ns))
+        except Exception as e:
+            print(f"Error loading servers from mcp.json: {e}")
+            return []
+    return []
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -129,25 +206,24 @@ def load_servers_from_mcp():
 
 
 @app.post("/analyze", response_model=AnalysisResponse)
-async def analyze_url(url_request: UrlRequest, background_tasks: BackgroundTasks):
+async def analyze_url(url_request: UrlRequest):
     """Analyze tool declarations from a single MCP server."""
     url = url_request.url
     server_name = url_request.server_name
-    request_id = f"req_{len(url)}{hash(url) % 10000}"
+    request_id = _new_request_id()
 
+    # URL is already normalized by UrlRequest.validate_url.
+    await analysis_queue.put((url, server_name))
     if server_name:
-        await analysis_queue.put((url, server_name))
         message = f"Analysis for {url} (Server: {server_name}) has been queued"
     else:
-        await analysis_queue.put(url)
         message = f"Analysis for {url} has been queued"
 
-    background_tasks.add_task(process_queue)
     return AnalysisResponse(request_id=request_id, status="queued", message=message)
 
 
 @app.post("/analyze-all", response_model=List[AnalysisResponse])
-async def analyze_all_urls(background_tasks: BackgroundTasks, parallel: bool = False):
+async def analyze_all_urls():
     """Analyze all MCP servers defined in mcp.json."""
     servers = load_servers_from_mcp()
     if not servers:
@@ -155,8 +231,8 @@ async def analyze_all_urls(background_tasks: BackgroundTasks, parallel: bool = F
 
     responses = []
     for url, server_name in servers:
-        request_id = f"req_{len(url)}{hash(url) % 10000}"
-        await analysis_queue.put((url, server_name))
+        request_id = _new_request_id()
+        await analysis_queue.put((_normalize_url(url), server_name))
         responses.append(
             AnalysisResponse(
                 request_id=request_id,
@@ -165,7 +241,6 @@ async def analyze_all_urls(background_tasks: BackgroundTasks, parallel: bool = F
             )
         )
 
-    background_tasks.add_task(process_queue)
     return responses
 
 
@@ -190,24 +265,36 @@ async def analyze_composition_endpoint(req: CompositionRequest):
         results_dir = os.path.join(os.getcwd(), "results")
         for filename in req.result_files:
             filepath = os.path.join(results_dir, filename)
-            if os.path.exists(filepath):
-                tools = collect_tools_from_result_file(filepath)
-                combined_tools.extend(tools)
-                match = re.match(r"\d{8}-\d{6}-(.+)\.json", filename)
-                name = match.group(1) if match else filename
-                if name not in server_names:
-                    server_names.append(name)
+            # EAFP: the stat keys the parse cache and raises for missing
+            # files, so no separate existence check is needed.
+            try:
+                tools = list(_cached_tools(filepath, os.stat(filepath).st_mtime_ns))
+            except FileNotFoundError:
+                print(f"Result file not found: {filepath}")
+                continue
+            combined_tools.extend(tools)
+            match = _RESULT_NAME_RE.match(filename)
+            name = match.group(1) if match else filename
+            if name not in server_names:
+                server_names.append(name)
 
     elif req.server_names:
         mcp_servers = load_servers_from_mcp_json()
-        for name in req.server_names:
-            if name in mcp_servers:
-                url = mcp_servers[name].get("url", "")
-                if url:
-                    tools = await collect_tools_from_server(url, name)
-                    combined_tools.extend(tools)
-                    if name not in server_names:
-                        server_names.append(name)
+        targets = [
+            (mcp_servers[name]["url"], name)
+            for name in req.server_names
+            if name in mcp_servers and mcp_servers[name].get("url")
+        ]
+        # Fan the MCP handshakes out in parallel; a dead server logs its
+        # failure and contributes an empty tool list instead of killing
+        # the batch.
+        results = await asyncio.gather(
+            *[collect_tools_from_server(url, name) for url, name in targets]
+        )
+        for (url, name), tools in zip(targets, results):
+            combined_tools.extend(tools)
+            if tools and name not in server_names:
+                server_names.append(name)
 
     if len(combined_tools) < 2 or len(server_names) < 2:
         raise HTTPException(
@@ -218,70 +305,116 @@ async def analyze_composition_endpoint(req: CompositionRequest):
     analysis = await analyze_composition(combined_tools, server_names)
     filepath = save_composition_result(analysis, server_names)
 
+    # mode="json" lets pydantic-core emit JSON-ready primitives directly, so
+    # the ORJSONResponse encoder doesn't re-traverse the tree through
+    # FastAPI's jsonable_encoder fallback. exclude_defaults drops the empty
+    # constraints/additional_tools lists that pad out large analyses.
     return {
         "status": "complete",
-        "result": analysis.model_dump(),
+        "result": analysis.model_dump(mode="json", exclude_defaults=True),
         "saved_to": filepath,
     }
 
 
+# Result summaries are memoized by (path, mtime): a listing only re-parses
+# files that changed since the last request instead of re-reading the whole
+# directory on every GET. Reads on a cache miss go through aiofiles so the
+# event loop is never blocked on disk I/O.
+
+_summary_cache: dict[tuple[str, int], dict] = {}
+_SUMMARY_CACHE_MAX = 2048
+
+
+def _composition_summary(path: str, data: dict) -> dict:
+    return {
+        "filename": os.path.basename(path),
+        "servers": data.get("servers_analyzed", []),
+        "risk_score": data.get("composition_risk_score", "Unknown"),
+        "surpluses_found": len(data.get("composition_surpluses", [])),
+        "action": data.get("action", "Unknown"),
+    }
+
+
+def _server_result_summary(path: str, data: dict) -> dict:
+    return {
+        "filename": os.path.basename(path),
+        "risk_score": data.get("overall_risk_score", "Unknown"),
+        "tools_analyzed": len(data.get("tool_assessments", [])),
+        "action": data.get("action", "Unknown"),
+    }
+
+
+async def _cached_summary(entry: os.DirEntry, summarize) -> dict:
+    key = (entry.path, entry.stat().st_mtime_ns)
+    summary = _summary_cache.get(key)
+    if summary is None:
+        async with aiofiles.open(entry.path, "rb") as fh:
+            raw = await fh.read()
+        # Results saved with --compress are gzipped JSON.
+        if entry.name.endswith(".gz"):
+            raw = gzip.decompress(raw)
+        summary = summarize(entry.path, orjson.loads(raw))
+        if len(_summary_cache) >= _SUMMARY_CACHE_MAX:
+            _summary_cache.clear()
+        _summary_cache[key] = summary
+    return summary
+
+
+def _scan_result_entries(results_dir: str) -> list[os.DirEntry]:
+    """Newest-first .json/.json.gz entries from a results directory ([] if missing)."""
+    try:
+        with os.scandir(results_dir) as it:
+            entries = [e for e in it if e.name.endswith((".json", ".json.gz"))]
+    except FileNotFoundError:
+        return []
+    entries.sort(key=lambda e: e.name, reverse=True)
+    return entries
+
+
+def _stream_result_list(entries: list[os.DirEntry], summarize) -> StreamingResponse:
+    """
+    Stream a JSON array of per-file summaries, one element per chunk.
+
+    Keeps the working set at one summary instead of materializing the whole
+    listing, and overlaps file reads with sending already-serialized chunks.
+    """
+
+    async def gen():
+        yield b"["
+        for i, e in enumerate(entries):
+            prefix = b"" if i == 0 else b","
+            yield prefix + orjson.dumps(await _cached_summary(e, summarize))
+        yield b"]"
+
+    return StreamingResponse(gen(), media_type="application/json")
+
+
 @app.get("/composition-results")
 async def list_composition_results():
     """List all saved composition analysis results."""
     results_dir = os.path.join(os.getcwd(), "results", "compositions")
-    if not os.path.exists(results_dir):
-        return []
-
-    files = glob.glob(os.path.join(results_dir, "*.json"))
-    results = []
-    for f in sorted(files, reverse=True):
-        with open(f, "r") as fh:
-            data = json.load(fh)
-        results.append(
-            {
-                "filename": os.path.basename(f),
-                "servers": data.get("servers_analyzed", []),
-                "risk_score": data.get("composition_risk_score", "Unknown"),
-                "surpluses_found": len(data.get("composition_surpluses", [])),
-                "action": data.get("action", "Unknown"),
-            }
-        )
-    return results
+    return _stream_result_list(_scan_result_entries(results_dir), _composition_summary)
 
 
 @app.get("/results")
 async def list_per_server_results():
     """List all saved per-server analysis results."""
     results_dir = os.path.join(os.getcwd(), "results")
-    if not os.path.exists(results_dir):
-        return []
-
-    files = glob.glob(os.path.join(results_dir, "*.json"))
-    results = []
-    for f in sorted(files, reverse=True):
-        basename = os.path.basename(f)
-        if basename.startswith("COMPOSITION"):
-            continue
-        with open(f, "r") as fh:
-            data = json.load(fh)
-        results.append(
-            {
-                "filename": basename,
-                "risk_score": data.get("overall_risk_score", "Unknown"),
-                "tools_analyzed": len(data.get("tool_assessments", [])),
-                "action": data.get("action", "Unknown"),
-            }
-        )
-    return results
+    entries = [
+        e for e in _scan_result_entries(results_dir) if not e.name.startswith("COMPOSITION")
+    ]
+    return _stream_result_list(entries, _server_result_summary)
 
 
 @app.get("/status")
 async def get_status():
     """Get the current status of the analysis queue."""
+    busy = _active_jobs > 0 or not analysis_queue.empty()
     return {
         "queue_size": analysis_queue.qsize(),
-        "is_processing": is_processing,
-        "status": "processing" if is_processing else "idle",
+        "active_jobs": _active_jobs,
+        "workers": WORKER_CONCURRENCY,
+        "status": "processing" if busy else "idle",
     }
 
 
@@ -305,7 +438,17 @@ async def root():
 
 def run():
     """Entry point for running the server."""
-    uvicorn.run("mcp_composition_scanner.server:app", host="0.0.0.0", port=8000, reload=True)
+    # uvloop + httptools replace the asyncio loop and h11 parser with their
+    # C implementations. Reload is off: it forks file watchers and is
+    # incompatible with multi-worker serving.
+    uvicorn.run(
+        "mcp_composition_scanner.server:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
 
 
 if __name__ == "__main__":
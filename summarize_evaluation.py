@@ -9,10 +9,16 @@ Usage:
     python summarize_evaluation.py
 """
 
+import functools
 import json
 import os
 import glob
 import re
+import sys
+from collections import Counter
+
+import orjson
+import pandas as pd
 
 
 def load_results(results_dir="results/evaluation"):
@@ -29,123 +35,126 @@ def load_results(results_dir="results/evaluation"):
     return results
 
 
+# Control pairs from the evaluation plan, built once at module scope.
+CONTROL_PAIRS = frozenset({
+    frozenset(["google-maps", "memory"]),
+    frozenset(["fetch", "google-maps"]),
+    frozenset(["postgres", "sqlite"]),
+})
+
+
+@functools.lru_cache(maxsize=None)
+def _classify(servers: tuple) -> str:
+    server_set = frozenset(s.lower().replace("20260227-120000-", "") for s in servers)
+    return "CONTROL" if server_set in CONTROL_PAIRS else "HIGH-RISK"
+
+
 def classify_pair(servers):
     """Classify a server pair as HIGH-RISK or CONTROL based on the evaluation plan."""
-    control_pairs = {
-        frozenset(["google-maps", "memory"]),
-        frozenset(["fetch", "google-maps"]),
-        frozenset(["postgres", "sqlite"]),
-    }
-    server_set = frozenset(s.lower().replace("20260227-120000-", "") for s in servers)
-    if server_set in control_pairs:
-        return "CONTROL"
-    return "HIGH-RISK"
+    return _classify(tuple(servers))
 
 
 def summarize(results):
-    """Build summary statistics."""
-    rows = []
-    for r in results:
-        d = r["data"]
-        servers = d.get("servers_analyzed", [])
-        category = classify_pair(servers)
-        n_surpluses = len(d.get("composition_surpluses", []))
-        n_chains = len(d.get("attack_chains", []))
-        risk_score = d.get("composition_risk_score", "Unknown")
-        action = d.get("action", "Unknown")
-
-        # Severity distribution of surpluses
-        severities = [s["severity"] for s in d.get("composition_surpluses", [])]
-        crit = severities.count("Critical")
-        high = severities.count("High")
-        med = severities.count("Medium")
-        low = severities.count("Low")
-
-        # Cross-server ratio
-        cross = sum(1 for s in d.get("composition_surpluses", []) if s.get("is_cross_server"))
-
-        rows.append({
-            "category": category,
-            "servers": " + ".join(servers),
-            "total_tools": d.get("total_tools", 0),
-            "pairwise": d.get("pairwise_combinations", 0),
-            "surpluses": n_surpluses,
-            "cross_server": cross,
-            "chains": n_chains,
-            "risk_score": risk_score,
-            "action": action,
-            "sev_crit": crit,
-            "sev_high": high,
-            "sev_med": med,
-            "sev_low": low,
-        })
-
-    return rows
-
-
-def print_markdown_table(rows):
+    """Build the per-pair summary table as a DataFrame (one vectorized pass)."""
+    df = pd.DataFrame(
+        {
+            "servers_list": [r["data"].get("servers_analyzed", []) for r in results],
+            "surplus_list": [r["data"].get("composition_surpluses", []) for r in results],
+            "total_tools": [r["data"].get("total_tools", 0) for r in results],
+            "pairwise": [r["data"].get("pairwise_combinations", 0) for r in results],
+            "chains": [len(r["data"].get("attack_chains", [])) for r in results],
+            "risk_score": [r["data"].get("composition_risk_score", "Unknown") for r in results],
+            "action": [r["data"].get("action", "Unknown") for r in results],
+        }
+    )
+
+    df["category"] = df["servers_list"].map(classify_pair)
+    df["servers"] = df["servers_list"].str.join(" + ")
+    df["surpluses"] = df["surplus_list"].str.len()
+    df["cross_server"] = df["surplus_list"].map(
+        lambda surps: sum(1 for s in surps if s.get("is_cross_server"))
+    )
+
+    # Severity distribution of surpluses: one Counter per row, expanded into
+    # columns in a single pass instead of four list.count scans per row.
+    sev = pd.DataFrame(
+        [Counter(s["severity"] for s in surps) for surps in df["surplus_list"]],
+        index=df.index,
+    )
+    for label, column in [
+        ("Critical", "sev_crit"),
+        ("High", "sev_high"),
+        ("Medium", "sev_med"),
+        ("Low", "sev_low"),
+    ]:
+        df[column] = sev[label].fillna(0).astype(int) if label in sev.columns else 0
+
+    return df.drop(columns=["servers_list", "surplus_list"])
+
+
+def print_markdown_table(df):
     """Print a markdown table for the paper."""
-    print("\n## Composition Analysis Evaluation Results\n")
-    print("| Category | Server Pair | Tools | Pairs | Σ_ij | Cross-Server | Chains | Risk | Action |")
-    print("|----------|-------------|-------|-------|------|-------------|--------|------|--------|")
-
-    for r in sorted(rows, key=lambda x: (x["category"] != "HIGH-RISK", x["servers"])):
-        print(
-            f"| {r['category']} "
-            f"| {r['servers']} "
-            f"| {r['total_tools']} "
-            f"| {r['pairwise']} "
-            f"| {r['surpluses']} "
-            f"| {r['cross_server']} "
-            f"| {r['chains']} "
-            f"| {r['risk_score']} "
-            f"| {r['action']} |"
+    # Buffer all output lines and flush once: one write() syscall instead
+    # of one per row and stat line.
+    out = []
+    out.append("\n## Composition Analysis Evaluation Results\n")
+    out.append("| Category | Server Pair | Tools | Pairs | Σ_ij | Cross-Server | Chains | Risk | Action |")
+    out.append("|----------|-------------|-------|-------|------|-------------|--------|------|--------|")
+
+    ordered = df.sort_values(
+        by=["category", "servers"],
+        key=lambda col: col != "HIGH-RISK" if col.name == "category" else col,
+    )
+    for r in ordered.itertuples():
+        out.append(
+            f"| {r.category} "
+            f"| {r.servers} "
+            f"| {r.total_tools} "
+            f"| {r.pairwise} "
+            f"| {r.surpluses} "
+            f"| {r.cross_server} "
+            f"| {r.chains} "
+            f"| {r.risk_score} "
+            f"| {r.action} |"
         )
 
-    # Summary stats
-    high_risk = [r for r in rows if r["category"] == "HIGH-RISK"]
-    control = [r for r in rows if r["category"] == "CONTROL"]
+    # Summary stats — aggregated column-wise instead of per-row Python sums
+    high_risk = df[df["category"] == "HIGH-RISK"]
+    control = df[df["category"] == "CONTROL"]
 
-    print("\n## Summary Statistics\n")
-    print(f"- **Total test pairs:** {len(rows)}")
-    print(f"- **High-risk pairs:** {len(high_risk)}")
-    print(f"- **Control pairs:** {len(control)}")
+    out.append("\n## Summary Statistics\n")
+    out.append(f"- **Total test pairs:** {len(df)}")
+    out.append(f"- **High-risk pairs:** {len(high_risk)}")
+    out.append(f"- **Control pairs:** {len(control)}")
 
-    if high_risk:
-        avg_surpluses_hr = sum(r["surpluses"] for r in high_risk) / len(high_risk)
-        total_chains_hr = sum(r["chains"] for r in high_risk)
-        print(f"- **Avg surpluses (high-risk):** {avg_surpluses_hr:.1f}")
-        print(f"- **Total attack chains (high-risk):** {total_chains_hr}")
+    if len(high_risk):
+        out.append(f"- **Avg surpluses (high-risk):** {high_risk['surpluses'].mean():.1f}")
+        out.append(f"- **Total attack chains (high-risk):** {int(high_risk['chains'].sum())}")
 
-    if control:
-        avg_surpluses_ctrl = sum(r["surpluses"] for r in control) / len(control)
-        print(f"- **Avg surpluses (control):** {avg_surpluses_ctrl:.1f}")
+    if len(control):
+        out.append(f"- **Avg surpluses (control):** {control['surpluses'].mean():.1f}")
 
     # Severity distribution
-    all_crit = sum(r["sev_crit"] for r in rows)
-    all_high = sum(r["sev_high"] for r in rows)
-    all_med = sum(r["sev_med"] for r in rows)
-    all_low = sum(r["sev_low"] for r in rows)
-    total_surpluses = sum(r["surpluses"] for r in rows)
-
-    print(f"\n### Surplus Severity Distribution (n={total_surpluses})\n")
-    print(f"- Critical: {all_crit}")
-    print(f"- High: {all_high}")
-    print(f"- Medium: {all_med}")
-    print(f"- Low: {all_low}")
+    sev_totals = df[["sev_crit", "sev_high", "sev_med", "sev_low"]].sum()
+    total_surpluses = int(df["surpluses"].sum())
+
+    out.append(f"\n### Surplus Severity Distribution (n={total_surpluses})\n")
+    out.append(f"- Critical: {int(sev_totals['sev_crit'])}")
+    out.append(f"- High: {int(sev_totals['sev_high'])}")
+    out.append(f"- Medium: {int(sev_totals['sev_med'])}")
+    out.append(f"- Low: {int(sev_totals['sev_low'])}")
 
     # Cross-server ratio
-    total_cross = sum(r["cross_server"] for r in rows)
+    total_cross = int(df["cross_server"].sum())
     if total_surpluses > 0:
-        print(f"\n- **Cross-server surpluses:** {total_cross}/{total_surpluses} ({100*total_cross/total_surpluses:.0f}%)")
+        out.append(f"\n- **Cross-server surpluses:** {total_cross}/{total_surpluses} ({100*total_cross/total_surpluses:.0f}%)")
 
     # Action distribution
-    actions = {}
-    for r in rows:
-        actions[r["action"]] = actions.get(r["action"], 0) + 1
-    print(f"\n### Recommended Actions\n")
-    for action, count in sorted(actions.items()):
-        print(f"- {action}: {count}")
+    out.append("\n### Recommended Actions\n")
+    for action, count in df["action"].value_counts().sort_index().items():
+        out.append(f"- {action}: {count}")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
@@ -155,13 +164,15 @@ def main():
         print("Run ./run_evaluation.sh first.")
         return
 
-    rows = summarize(results)
-    print_markdown_table(rows)
+    df = summarize(results)
+    print_markdown_table(df)
 
     # Also save as JSON for further processing
+    rows = df.to_dict(orient="records")
     output_path = "results/evaluation/summary.json"
-    with open(output_path, "w") as f:
-        json.dump(rows, f, indent=2)
+    # SERIALIZE_NUMPY handles the numpy ints pandas leaves in the records.
+    with open(output_path, "wb") as f:
+        f.write(orjson.dumps(rows, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     print(f"\n\nRaw data saved to: {output_path}")
 
 